@@ -1,6 +1,7 @@
 import os
 import json
 import requests
+from urllib.parse import urlparse
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 import nltk
@@ -8,6 +9,8 @@ from nltk.tokenize import sent_tokenize
 from nltk.corpus import stopwords
 import re
 
+from trend_aggregates import record_fact_check_event, get_trends
+
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
@@ -19,6 +22,7 @@ def index():
         "message": "Fact Check API is running",
         "endpoints": {
             "/api/fact-check": "POST - Check facts in provided content",
+            "/api/trends": "GET - Rolling credibility trends and most-flagged claims/publishers",
         }
     })
 
@@ -358,6 +362,7 @@ def fact_check_endpoint():
     claim_analysis = []
     fake_claims = []
     real_claims = []
+    flagged_claimants = []
 
     for result in all_results:
         fc_result = result["fact_check_result"]
@@ -407,6 +412,8 @@ def fact_check_endpoint():
                         'false', 'fake', 'pants on fire', 'incorrect', 'misleading', 'mostly false'
                     ]):
                         fake_claims.append(info)
+                        if c.get('claimant'):
+                            flagged_claimants.append(c['claimant'])
                     # Identify real/true claims
                     if any(word in rating_text for word in [
                         'true', 'mostly true', 'accurate', 'correct'
@@ -447,6 +454,28 @@ def fact_check_endpoint():
         "sources": len(sources_set),
         "factChecks": fact_checks_count
     }
+
+    # Publishers of flagged content: who made the claims, plus the checked article's site
+    flagged_publishers = list(flagged_claimants)
+    if fake_claims and url:
+        host = (urlparse(url).hostname or "").lower()
+        if host.startswith("www."):
+            host = host[4:]
+        if host:
+            flagged_publishers.append(host)
+
+    # Trend recording is a side effect; never fail the fact check because of it
+    try:
+        record_fact_check_event(
+            label=overall_label,
+            score=overall_score,
+            verified=bool(scores),
+            flagged_claims=[info['claim'] for info in fake_claims],
+            flagged_publishers=flagged_publishers,
+            flagging_reviewers=[info['reviewer'] for info in fake_claims if info['reviewer']]
+        )
+    except Exception as e:
+        print(f"Trend recording error: {e}")
     
     return jsonify({
         'status': 'success',
@@ -458,5 +487,18 @@ def fact_check_endpoint():
         'real_claims': real_claims
     })
 
+@app.route('/api/trends', methods=['GET'])
+def trends_endpoint():
+    try:
+        trends = get_trends()
+    except Exception as e:
+        print(f"Trends error: {e}")
+        return jsonify({
+            'status': 'error',
+            'message': 'Trend data is currently unavailable'
+        }), 503
+    trends['status'] = 'success'
+    return jsonify(trends)
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
@@ -1,8 +1,19 @@
 import os
+import sys
 import glob
+import json
 import re
 import random
-from typing import List, Optional, Tuple
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
 
 import numpy as np
 import pandas as pd
@@ -21,12 +32,15 @@ from sklearn.naive_bayes import MultinomialNB
 DATA_ROOT = os.path.join(os.path.dirname(__file__), 'data')
 PFNC_DIR = os.path.join(DATA_ROOT, 'Philippine-Fake-News-Corpus')
 SLANG_PATH = os.path.join(DATA_ROOT, 'filipino_slang_words.txt')
+REPORTS_DIR = os.path.join(os.path.dirname(__file__), 'reports')
 
 
 def _find_pfnc_csv() -> Optional[str]:
     """Find a CSV file inside the Philippine-Fake-News-Corpus directory."""
     pattern = os.path.join(PFNC_DIR, '**', '*.csv')
-    files = glob.glob(pattern, recursive=True)
+    # The slang word list is shipped alongside the corpus; it is not news data
+    files = [f for f in sorted(glob.glob(pattern, recursive=True))
+             if os.path.basename(f) != 'filipino_slang_words.csv']
     return files[0] if files else None
 
 
@@ -77,7 +91,7 @@ def load_pfnc_dataset() -> Optional[pd.DataFrame]:
         print(f"PFNC CSV not found under: {PFNC_DIR}")
         return None
 
-    df = pd.read_csv(csv_path, encoding='utf-8', errors='ignore')
+    df = pd.read_csv(csv_path, encoding='utf-8', encoding_errors='ignore')
     text_col, label_col = _select_text_and_label_columns(df)
     df = df[[text_col, label_col]].rename(columns={text_col: 'text', label_col: 'label'})
     df['label'] = _normalize_labels(df['label'])
@@ -89,34 +103,63 @@ def load_pfnc_dataset() -> Optional[pd.DataFrame]:
     return df
 
 
-def visualize_label_distribution(labels: pd.Series, title: str):
-    ax = sns.countplot(x=labels)
+def _show_or_save(fig, save_path: Optional[str]):
+    """Save the figure to `save_path` (headless runs) or show it interactively."""
+    fig.tight_layout()
+    if save_path:
+        fig.savefig(save_path)
+        plt.close(fig)
+    else:
+        plt.show()
+
+
+def visualize_label_distribution(labels: pd.Series, title: str, save_path: Optional[str] = None):
+    fig, ax = plt.subplots()
+    sns.countplot(x=labels, ax=ax)
     ax.set_title(title)
     ax.set_xlabel('Class')
     ax.set_ylabel('Count')
-    plt.tight_layout()
-    plt.show()
+    _show_or_save(fig, save_path)
 
 
-def visualize_confusion_matrix(y_true, y_pred, labels: List[str], title: str):
+def visualize_confusion_matrix(y_true, y_pred, labels: List[str], title: str, save_path: Optional[str] = None):
     cm = confusion_matrix(y_true, y_pred, labels=labels)
     cm_df = pd.DataFrame(cm, index=labels, columns=labels)
-    ax = sns.heatmap(cm_df, annot=True, fmt='d', cmap='Blues')
+    fig, ax = plt.subplots()
+    sns.heatmap(cm_df, annot=True, fmt='d', cmap='Blues', ax=ax)
     ax.set_title(title)
     ax.set_xlabel('Predicted')
     ax.set_ylabel('Actual')
-    plt.tight_layout()
-    plt.show()
+    _show_or_save(fig, save_path)
+
+
+def _output_path(output_dir: Optional[str], filename: str) -> Optional[str]:
+    return os.path.join(output_dir, filename) if output_dir else None
 
 
-def train_random_forest_on_pfnc():
-    """Train a Random Forest news credibility classifier on the PFNC dataset."""
-    df = load_pfnc_dataset()
+def _write_report(output_dir: Optional[str], filename: str, text: str):
+    path = _output_path(output_dir, filename)
+    if path:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(f"Saved report: {path}")
+
+
+def train_random_forest_on_pfnc(df: Optional[pd.DataFrame] = None, output_dir: Optional[str] = None,
+                                n_jobs: Optional[int] = None) -> Optional[str]:
+    """Train a Random Forest news credibility classifier on the PFNC dataset.
+
+    Pass an already loaded `df` to avoid re-reading the corpus. When `output_dir`
+    is set, the report and plots are written there instead of being shown.
+    """
+    if df is None:
+        df = load_pfnc_dataset()
     if df is None:
-        return
+        return None
 
     # Basic visualization of class distribution
-    visualize_label_distribution(df['label'], 'PFNC Class Distribution')
+    visualize_label_distribution(df['label'], 'PFNC Class Distribution',
+                                 save_path=_output_path(output_dir, 'pfnc_class_distribution.png'))
 
     X_train, X_test, y_train, y_test = train_test_split(
         df['text'].astype(str), df['label'].astype(str), test_size=0.2, random_state=42, stratify=df['label']
@@ -125,17 +168,21 @@ def train_random_forest_on_pfnc():
     # Vectorize -> Reduce dimension -> Random Forest
     tfidf = TfidfVectorizer(ngram_range=(1, 2), max_features=10000, min_df=2)
     svd = TruncatedSVD(n_components=300, random_state=42)
-    rf = RandomForestClassifier(n_estimators=300, random_state=42, class_weight='balanced')
+    rf = RandomForestClassifier(n_estimators=300, random_state=42, class_weight='balanced', n_jobs=n_jobs)
 
     pipeline = make_pipeline(tfidf, svd, rf)
     pipeline.fit(X_train, y_train)
 
     y_pred = pipeline.predict(X_test)
+    report = classification_report(y_test, y_pred)
     print('\nRandom Forest on PFNC — Classification Report')
-    print(classification_report(y_test, y_pred))
+    print(report)
+    _write_report(output_dir, 'pfnc_random_forest_report.txt', report)
 
     visualize_confusion_matrix(y_test, y_pred, labels=sorted(df['label'].unique()),
-                               title='PFNC Random Forest Confusion Matrix')
+                               title='PFNC Random Forest Confusion Matrix',
+                               save_path=_output_path(output_dir, 'pfnc_random_forest_confusion_matrix.png'))
+    return report
 
 
 def _tokenize_words(text: str) -> List[str]:
@@ -184,13 +231,25 @@ def build_slang_dataset_from_corpus(slang_words: List[str], df_pfnc: Optional[pd
     return ds
 
 
-def train_naive_bayes_for_slang():
-    """Train a Naive Bayes classifier to detect Filipino slang words."""
-    df_pfnc = load_pfnc_dataset()
-    slang_words = load_slang_words()
+def train_naive_bayes_for_slang(df_pfnc: Optional[pd.DataFrame] = None, slang_words: Optional[List[str]] = None,
+                                output_dir: Optional[str] = None) -> str:
+    """Train a Naive Bayes classifier to detect Filipino slang words.
+
+    `df_pfnc` and `slang_words` are loaded on demand when not provided. When
+    `output_dir` is set, the report and plots are written there instead of being shown.
+    """
+    if df_pfnc is None:
+        df_pfnc = load_pfnc_dataset()
+    if slang_words is None:
+        slang_words = load_slang_words()
     ds = build_slang_dataset_from_corpus(slang_words, df_pfnc)
+    return train_naive_bayes_on_slang_dataset(ds, output_dir=output_dir)
 
-    visualize_label_distribution(ds['label'], 'Slang Dataset Class Distribution')
+
+def train_naive_bayes_on_slang_dataset(ds: pd.DataFrame, output_dir: Optional[str] = None) -> str:
+    """Train the slang Naive Bayes classifier on a prebuilt word/label dataset."""
+    visualize_label_distribution(ds['label'], 'Slang Dataset Class Distribution',
+                                 save_path=_output_path(output_dir, 'slang_class_distribution.png'))
 
     X_train, X_test, y_train, y_test = train_test_split(
         ds['word'].astype(str), ds['label'].astype(str), test_size=0.2, random_state=42, stratify=ds['label']
@@ -203,30 +262,216 @@ def train_naive_bayes_for_slang():
     pipeline.fit(X_train, y_train)
 
     y_pred = pipeline.predict(X_test)
+    report = classification_report(y_test, y_pred)
     print('\nNaive Bayes for Slang — Classification Report')
-    print(classification_report(y_test, y_pred))
+    print(report)
 
     visualize_confusion_matrix(y_test, y_pred, labels=sorted(ds['label'].unique()),
-                               title='Slang Naive Bayes Confusion Matrix')
+                               title='Slang Naive Bayes Confusion Matrix',
+                               save_path=_output_path(output_dir, 'slang_naive_bayes_confusion_matrix.png'))
 
-    # Show top char-ngrams per class (interpretability)
-    vec_fit = vec.fit(X_train)
-    X_train_vec = vec_fit.transform(X_train)
-    nb_fit = MultinomialNB().fit(X_train_vec, y_train)
-    feature_names = np.array(vec_fit.get_feature_names_out())
-    for i, cls in enumerate(nb_fit.classes_):
-        top_idx = np.argsort(nb_fit.class_log_prior_[i] + nb_fit.feature_log_prob_[i])[-15:]
-        print(f"Top n-grams for class={cls}: {feature_names[top_idx]}")
+    # Show top char-ngrams per class (interpretability), reusing the fitted pipeline steps
+    feature_names = np.array(vec.get_feature_names_out())
+    top_lines = []
+    for i, cls in enumerate(nb.classes_):
+        top_idx = np.argsort(nb.class_log_prior_[i] + nb.feature_log_prob_[i])[-15:]
+        top_lines.append(f"Top n-grams for class={cls}: {feature_names[top_idx]}")
+    print('\n'.join(top_lines))
 
+    report = report + '\n' + '\n'.join(top_lines) + '\n'
+    _write_report(output_dir, 'slang_naive_bayes_report.txt', report)
+    return report
 
-def main():
+
+# --- Headless training orchestrator ---
+
+# Linux lets a process reset its own peak RSS (VmHWM), which gives true per-stage
+# peaks. Elsewhere stages fall back to ru_maxrss, the process-lifetime peak.
+_CLEAR_REFS = '/proc/self/clear_refs'
+_PROC_STATUS = '/proc/self/status'
+_stage_peaks: List[float] = []  # Running peak of each open stage, innermost last
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Lifetime peak resident set size of this process in MiB, if measurable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _children_peak_rss_mb() -> Optional[float]:
+    """Largest lifetime peak RSS among terminated child processes in MiB, if measurable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _read_hwm_mb() -> Optional[float]:
+    """Current VmHWM (peak RSS since the last reset) in MiB, Linux only."""
+    try:
+        with open(_PROC_STATUS, 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _reset_hwm() -> bool:
+    """Reset this process's VmHWM so the next reading covers only what follows."""
+    try:
+        with open(_CLEAR_REFS, 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _round_mb(value: Optional[float]) -> Optional[float]:
+    return round(value, 1) if value is not None else None
+
+
+@contextmanager
+def _timed_stage(name: str, timings: List[Dict], process: str = 'parent'):
+    """Record wall time and peak RSS of this process during a stage into `timings`.
+
+    Stages may nest; an outer stage's peak includes the peaks of its inner stages.
+    """
+    if _stage_peaks:
+        # Fold the enclosing stage's peak so far before resetting the counter
+        _stage_peaks[-1] = max(_stage_peaks[-1], _read_hwm_mb() or 0.0)
+    per_stage = _reset_hwm() and _read_hwm_mb() is not None
+    _stage_peaks.append(0.0)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        inner_peak = _stage_peaks.pop()
+        if per_stage:
+            peak = max(inner_peak, _read_hwm_mb() or 0.0)
+            scope = 'stage'
+        else:
+            peak = _peak_rss_mb()
+            scope = 'process_lifetime'
+        if _stage_peaks and peak is not None:
+            _stage_peaks[-1] = max(_stage_peaks[-1], peak)
+        timings.append({'stage': name, 'process': process, 'pid': os.getpid(),
+                        'seconds': round(elapsed, 3), 'peak_rss_mb': _round_mb(peak), 'peak_scope': scope})
+        peak_str = f"{peak:.1f} MiB" if peak is not None else 'n/a'
+        if scope == 'process_lifetime':
+            peak_str += ' (process lifetime high-water mark)'
+        print(f"[stage] {name}: {elapsed:.2f}s | {process} peak RSS {peak_str} (pid={os.getpid()})")
+
+
+def _run_training_task(task: str, data: pd.DataFrame, output_dir: str, rf_n_jobs: Optional[int]) -> List[Dict]:
+    """Worker entry point: run one training task headlessly and return its stage timings.
+
+    `data` is the PFNC text/label frame for the Random Forest and the prebuilt
+    slang word dataset for Naive Bayes, so each worker only receives what it trains on.
+    """
+    plt.switch_backend('Agg')
     sns.set_theme(style='whitegrid')
-    print('--- Training Random Forest on PFNC ---')
-    train_random_forest_on_pfnc()
+    timings: List[Dict] = []
+    with _timed_stage(task, timings, process='worker'):
+        if task == 'random_forest':
+            train_random_forest_on_pfnc(data, output_dir=output_dir, n_jobs=rf_n_jobs)
+        elif task == 'naive_bayes_slang':
+            train_naive_bayes_on_slang_dataset(data, output_dir=output_dir)
+        else:
+            raise ValueError(f'Unknown training task: {task}')
+    return timings
+
+
+def _training_pool(workers: int) -> ProcessPoolExecutor:
+    # A fresh process per task keeps each worker's peak RSS tied to one task.
+    # max_tasks_per_child needs Python 3.11+; older versions share workers and
+    # rely on the per-stage VmHWM reset instead.
+    if sys.version_info >= (3, 11):
+        return ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1)
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+def run_training(output_dir: str = REPORTS_DIR, max_workers: Optional[int] = None) -> Dict:
+    """Load the data once, train all models in parallel processes, and save reports/plots.
+
+    Per-stage wall time and peak memory are printed and written to
+    `<output_dir>/timings.json`, together with a combined peak estimate for
+    sizing: the parent's peak while training plus the largest worker peaks
+    that can run at the same time. Returns the same summary.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    timings: List[Dict] = []
+    worker_timings: List[Dict] = []
+
+    with _timed_stage('total', timings):
+        with _timed_stage('load_data', timings):
+            df_pfnc = load_pfnc_dataset()
+            slang_words = load_slang_words()
+
+        num_tasks = 2 if df_pfnc is not None else 1
+        cpus = os.cpu_count() or 1
+        workers = max(1, min(max_workers or cpus, num_tasks))
+        # Split the remaining cores across the forest's trees so workers don't oversubscribe
+        rf_n_jobs = max(1, cpus - workers + 1)
+
+        with _timed_stage('train_parallel', timings):
+            with _training_pool(workers) as pool:
+                futures = []
+                # Start the longest job first; the slang dataset is built while it trains
+                if df_pfnc is not None:
+                    futures.append(pool.submit(_run_training_task, 'random_forest', df_pfnc[['text', 'label']],
+                                               output_dir, rf_n_jobs))
+                else:
+                    print('Skipping Random Forest: PFNC dataset unavailable.')
+
+                with _timed_stage('build_slang_dataset', timings):
+                    slang_ds = build_slang_dataset_from_corpus(slang_words, df_pfnc)
+                futures.append(pool.submit(_run_training_task, 'naive_bayes_slang', slang_ds,
+                                           output_dir, rf_n_jobs))
+
+                for future in futures:
+                    worker_timings.extend(future.result())
+    timings.extend(worker_timings)
+
+    parent_peak = next(t['peak_rss_mb'] for t in timings if t['stage'] == 'train_parallel')
+    worker_peaks = sorted((t['peak_rss_mb'] for t in worker_timings if t['peak_rss_mb'] is not None),
+                          reverse=True)
+    concurrent_peak = sum(worker_peaks[:workers]) if worker_peaks else None
+    summary = {
+        'stages': timings,
+        'workers': workers,
+        'peak_rss_mb': {
+            'parent_during_training': parent_peak,
+            'largest_child': _round_mb(_children_peak_rss_mb()),
+            'concurrent_workers': _round_mb(concurrent_peak),
+            'combined': _round_mb(parent_peak + concurrent_peak
+                                  if parent_peak is not None and concurrent_peak is not None else None),
+        },
+    }
+    print(f"Combined peak RSS estimate: {summary['peak_rss_mb']['combined']} MiB "
+          f"(parent + {workers} concurrent worker(s))")
+
+    timings_path = os.path.join(output_dir, 'timings.json')
+    with open(timings_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+    print(f"Saved stage timings: {timings_path}")
+    return summary
 
-    print('\n--- Training Naive Bayes for Filipino Slang ---')
-    train_naive_bayes_for_slang()
+
+def main():
+    parser = argparse.ArgumentParser(description='Train CrediNews models headlessly.')
+    parser.add_argument('--output-dir', default=REPORTS_DIR,
+                        help='Directory for classification reports, plots and timings.')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Maximum number of parallel training processes.')
+    args = parser.parse_args()
+    run_training(output_dir=args.output_dir, max_workers=args.workers)
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,128 @@
+import json
+import os
+
+import pytest
+
+import trend_aggregates as ta
+
+
+HOUR = 3600
+DAY = 24 * HOUR
+NOW = 1_700_000_000
+
+
+def _event(ts, label="Not Credible", score=0.0, verified=True, **lists):
+    event = {"timestamp": ts, "label": label, "score": score, "verified": verified}
+    for field in ("flaggedClaims", "flaggedPublishers", "flaggingReviewers"):
+        event[field] = lists.get(field, [])
+    return event
+
+
+@pytest.fixture
+def trends_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(ta, "TRENDS_EVENT_LOG", str(tmp_path / "events.jsonl"))
+    monkeypatch.setattr(ta, "TRENDS_SNAPSHOT", str(tmp_path / "snapshot.json"))
+    ta._reset_trend_aggregates()
+    yield tmp_path
+    ta._reset_trend_aggregates()
+
+
+def _restart():
+    """Simulate a fresh process: drop in-memory state and reload from disk."""
+    ta._reset_trend_aggregates()
+    ta.load_trend_aggregates()
+
+
+def test_count_min_sketch_never_underestimates():
+    sketch = ta.CountMinSketch(width=16, depth=3)
+    truth = {f"key{i}": i + 1 for i in range(40)}
+    for key, count in truth.items():
+        sketch.add(key, count)
+    for key, count in truth.items():
+        assert sketch.estimate(key) >= count
+
+
+def test_top_k_replaces_weakest_candidate():
+    tracker = ta.TopKTracker(k=2)
+    for text in ["a claim", "b claim", "c claim", "c claim", "C Claim "]:
+        tracker.add(text)
+    items = tracker.items()
+    assert [item["text"] for item in items][0] == "C Claim"
+    assert items[0]["count"] == 3
+    assert len(items) == 2
+
+
+def test_windowed_top_k_ages_out_old_slices():
+    windowed = ta.WindowedTopK(k=3, slice_seconds=DAY)
+    old, recent = NOW - 10 * DAY, NOW - HOUR
+    for _ in range(5):
+        windowed.add("old claim", old, window_start=old - DAY)
+    windowed.add("new claim", recent, window_start=NOW - 7 * DAY)
+    assert [item["text"] for item in windowed.items(NOW - 7 * DAY)] == ["new claim"]
+    assert len(windowed.slices) == 1
+
+
+def test_counters_evict_on_add_and_skip_unverified_scores():
+    counters = ta.RollingTrendCounters(bucket_seconds=HOUR, num_buckets=24)
+    counters.add(_event(NOW - 2 * DAY, score=0.9), NOW - 2 * DAY)
+    counters.add(_event(NOW, label="Mixed Credibility", score=0.5), NOW)
+    counters.add(_event(NOW, label="Unverified", score=0.5, verified=False), NOW)
+    assert len(counters.buckets) == 1
+
+    window = counters.snapshot(NOW)
+    assert window["checks"] == 2
+    assert window["unverifiedChecks"] == 1
+    assert window["averageScore"] == 0.5
+    assert window["labels"] == {"Mixed Credibility": 1, "Unverified": 1}
+
+
+def test_record_dedupes_by_normalized_key(trends_dir):
+    for _ in range(7):
+        ta.record_fact_check_event("Not Credible", 0.0, True, ["Claim A", "claim a "],
+                                   ["example.com"], ["Rappler"])
+    trends = ta.get_trends()
+    assert trends["topFlaggedClaims"] == [{"text": "Claim A", "count": 7}]
+    assert trends["topFlaggedPublishers"] == [{"text": "example.com", "count": 7}]
+    assert trends["window"]["flaggedClaims"] == 7
+
+
+def test_snapshot_round_trip_replays_only_the_tail(trends_dir, monkeypatch):
+    monkeypatch.setattr(ta, "TRENDS_SNAPSHOT_EVERY", 3)
+    for i in range(4):
+        ta.record_fact_check_event("Not Credible", 0.0, True, [f"claim {i % 2}"], [], [])
+    with open(ta.TRENDS_SNAPSHOT, encoding="utf-8") as f:
+        snapshot = json.load(f)
+    assert snapshot["totalChecks"] == 3
+    assert snapshot["logOffset"] < os.path.getsize(ta.TRENDS_EVENT_LOG)
+
+    before = ta.get_trends()
+    _restart()
+    after = ta.get_trends(now=before["generatedAt"])
+    assert after["totalChecks"] == 4
+    assert after["window"] == before["window"]
+    assert after["topFlaggedClaims"] == before["topFlaggedClaims"]
+
+
+def test_replay_skips_malformed_lines_and_torn_tail(trends_dir):
+    ta.record_fact_check_event("Not Credible", 0.0, True, ["first claim"], [], [])
+    with open(ta.TRENDS_EVENT_LOG, "a", encoding="utf-8") as f:
+        f.write("{}\n[1, 2]\n")
+        f.write(json.dumps({"timestamp": NOW, "label": "x", "score": 0.1, "flaggedClaims": "abc"}) + "\n")
+        f.write('{"timestamp": 1, "lab')
+
+    _restart()
+    assert ta.get_trends()["totalChecks"] == 1
+
+    # The torn line was terminated, so the next event is not glued onto it
+    ta.record_fact_check_event("Highly Credible", 1.0, True, [], [], [])
+    _restart()
+    assert ta.get_trends()["totalChecks"] == 2
+
+
+def test_stale_snapshot_is_ignored(trends_dir):
+    ta.record_fact_check_event("Not Credible", 0.0, True, [], [], [])
+    ta._save_trend_snapshot()
+    with open(ta.TRENDS_EVENT_LOG, "w", encoding="utf-8"):
+        pass  # Log truncated after the checkpoint
+    _restart()
+    assert ta.get_trends()["totalChecks"] == 0
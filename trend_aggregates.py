@@ -0,0 +1,473 @@
+"""Incrementally maintained fact-check trends for the /api/trends endpoint.
+
+Every fact-check outcome is appended to TRENDS_EVENT_LOG and folded into the
+in-memory aggregates below, so trends never require re-scanning past results.
+The aggregates are checkpointed to TRENDS_SNAPSHOT together with the log offset
+they cover; on first use only the log tail after that offset is replayed.
+
+Note: the aggregates live in this process. Run the API as a single process
+(as app.run does); separate workers would each serve their own counts.
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import Counter, deque
+
+
+TRENDS_EVENT_LOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'fact_check_events.jsonl')
+TRENDS_SNAPSHOT = os.path.join(os.path.dirname(TRENDS_EVENT_LOG), 'fact_check_trends_snapshot.json')
+TRENDS_SNAPSHOT_VERSION = 1
+TRENDS_SNAPSHOT_EVERY = 200  # Checkpoint the aggregates every N events
+TRENDS_BUCKET_SECONDS = 3600  # One counter bucket per hour
+TRENDS_WINDOW_BUCKETS = 24 * 7  # Keep a rolling 7-day window
+TRENDS_TOPK_SLICE_SECONDS = 24 * 3600  # Top-k sketches rotate daily
+TRENDS_TOP_K = 10
+
+
+def normalize_key(text):
+    """Key used to count claims/publishers: case- and whitespace-insensitive."""
+    return (text or "").strip().lower()
+
+
+class CountMinSketch:
+    """Fixed-size approximate frequency counter (over-estimates, never under-estimates)."""
+
+    def __init__(self, width=1024, depth=4):
+        self.width = width
+        self.depth = depth
+        self.table = [[0] * width for _ in range(depth)]
+
+    def _indexes(self, key):
+        # Stable across processes, unlike the built-in hash()
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=8 * self.depth).digest()
+        for row in range(self.depth):
+            chunk = digest[row * 8:(row + 1) * 8]
+            yield row, int.from_bytes(chunk, 'little') % self.width
+
+    def add(self, key, count=1):
+        """Add `count` occurrences of `key` and return its new estimated frequency."""
+        estimate = None
+        for row, idx in self._indexes(key):
+            self.table[row][idx] += count
+            value = self.table[row][idx]
+            estimate = value if estimate is None else min(estimate, value)
+        return estimate
+
+    def estimate(self, key):
+        return min(self.table[row][idx] for row, idx in self._indexes(key))
+
+    def to_dict(self):
+        return {"width": self.width, "depth": self.depth, "table": self.table}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data["width"], data["depth"])
+        sketch.table = data["table"]
+        return sketch
+
+
+class TopKTracker:
+    """Heavy-hitter tracker: a count-min sketch plus the k keys with the highest estimates."""
+
+    def __init__(self, k=TRENDS_TOP_K):
+        self.k = k
+        self.sketch = CountMinSketch()
+        self.top = {}  # normalized key -> {"text": display text, "count": estimate}
+
+    def add(self, text):
+        key = normalize_key(text)
+        if not key:
+            return
+        estimate = self.sketch.add(key)
+        if key in self.top or len(self.top) < self.k:
+            self.top[key] = {"text": text.strip(), "count": estimate}
+            return
+        # Replace the weakest candidate if this key has overtaken it
+        weakest = min(self.top, key=lambda k: self.top[k]["count"])
+        if estimate > self.top[weakest]["count"]:
+            del self.top[weakest]
+            self.top[key] = {"text": text.strip(), "count": estimate}
+
+    def items(self):
+        return sorted(self.top.values(), key=lambda item: item["count"], reverse=True)
+
+    def to_dict(self):
+        return {"k": self.k, "sketch": self.sketch.to_dict(), "top": self.top}
+
+    @classmethod
+    def from_dict(cls, data):
+        tracker = cls(data["k"])
+        tracker.sketch = CountMinSketch.from_dict(data["sketch"])
+        tracker.top = data["top"]
+        return tracker
+
+
+class WindowedTopK:
+    """Top-k over a rolling window, kept as one TopKTracker per time slice.
+
+    Slices that end before the window start are dropped. The result ranks the
+    union of each slice's candidates by their summed sketch estimates, so a key
+    must be a heavy hitter in at least one slice to be reported.
+    """
+
+    def __init__(self, k=TRENDS_TOP_K, slice_seconds=TRENDS_TOPK_SLICE_SECONDS):
+        self.k = k
+        self.slice_seconds = slice_seconds
+        self.slices = {}  # slice start -> TopKTracker
+        self.order = deque()  # slice starts in ascending order
+
+    def _slice_start(self, ts):
+        return int(ts // self.slice_seconds) * self.slice_seconds
+
+    def evict(self, window_start):
+        while self.order and self.order[0] + self.slice_seconds <= window_start:
+            del self.slices[self.order.popleft()]
+
+    def add(self, text, ts, window_start):
+        if ts < window_start:
+            return
+        self.evict(window_start)
+        start = self._slice_start(ts)
+        if start not in self.slices:
+            self.slices[start] = TopKTracker(self.k)
+            if self.order and start < self.order[-1]:
+                # Rare out-of-order event (e.g. clock skew); keep starts sorted
+                self.order = deque(sorted(list(self.order) + [start]))
+            else:
+                self.order.append(start)
+        self.slices[start].add(text)
+
+    def items(self, window_start):
+        self.evict(window_start)
+        candidates = {}
+        for tracker in self.slices.values():
+            for key, item in tracker.top.items():
+                candidates.setdefault(key, item["text"])
+        ranked = [{
+            "text": text,
+            "count": sum(tracker.sketch.estimate(key) for tracker in self.slices.values()),
+        } for key, text in candidates.items()]
+        ranked.sort(key=lambda item: item["count"], reverse=True)
+        return ranked[:self.k]
+
+    def to_dict(self):
+        return {
+            "k": self.k,
+            "sliceSeconds": self.slice_seconds,
+            "slices": [[start, self.slices[start].to_dict()] for start in self.order],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        windowed = cls(data["k"], data["sliceSeconds"])
+        for start, tracker in data["slices"]:
+            windowed.slices[start] = TopKTracker.from_dict(tracker)
+            windowed.order.append(start)
+        return windowed
+
+
+def _empty_bucket():
+    return {"checks": 0, "unverified": 0, "scoreSum": 0.0, "labels": Counter(), "flaggedClaims": 0}
+
+
+class RollingTrendCounters:
+    """Time-bucketed counters over a sliding window.
+
+    Window totals are summed from the buckets on read (at most `num_buckets`),
+    which avoids the drift of a running float total.
+    """
+
+    def __init__(self, bucket_seconds=TRENDS_BUCKET_SECONDS, num_buckets=TRENDS_WINDOW_BUCKETS):
+        self.bucket_seconds = bucket_seconds
+        self.num_buckets = num_buckets
+        self.buckets = {}  # bucket start -> counters
+        self.order = deque()  # bucket starts in ascending order
+
+    def _bucket_start(self, ts):
+        return int(ts // self.bucket_seconds) * self.bucket_seconds
+
+    def window_start(self, now):
+        return self._bucket_start(now) - (self.num_buckets - 1) * self.bucket_seconds
+
+    def evict(self, now):
+        window_start = self.window_start(now)
+        while self.order and self.order[0] < window_start:
+            del self.buckets[self.order.popleft()]
+
+    def add(self, event, now):
+        self.evict(now)
+        start = self._bucket_start(event["timestamp"])
+        if start < self.window_start(now):
+            return
+        if start not in self.buckets:
+            self.buckets[start] = _empty_bucket()
+            if self.order and start < self.order[-1]:
+                self.order = deque(sorted(list(self.order) + [start]))
+            else:
+                self.order.append(start)
+        bucket = self.buckets[start]
+        bucket["checks"] += 1
+        # Unverified outcomes carry a placeholder score; keep them out of the average
+        if event["verified"]:
+            bucket["scoreSum"] += event["score"]
+        else:
+            bucket["unverified"] += 1
+        bucket["labels"][event["label"]] += 1
+        bucket["flaggedClaims"] += len(event["flaggedClaims"])
+
+    def snapshot(self, now):
+        self.evict(now)
+        series = []
+        totals = _empty_bucket()
+        for start in self.order:
+            bucket = self.buckets[start]
+            verified = bucket["checks"] - bucket["unverified"]
+            series.append({
+                "bucketStart": start,
+                "checks": bucket["checks"],
+                "unverifiedChecks": bucket["unverified"],
+                "averageScore": bucket["scoreSum"] / verified if verified else None,
+                "labels": dict(bucket["labels"]),
+                "flaggedClaims": bucket["flaggedClaims"],
+            })
+            totals["checks"] += bucket["checks"]
+            totals["unverified"] += bucket["unverified"]
+            totals["scoreSum"] += bucket["scoreSum"]
+            totals["labels"].update(bucket["labels"])
+            totals["flaggedClaims"] += bucket["flaggedClaims"]
+        verified = totals["checks"] - totals["unverified"]
+        return {
+            "windowStart": self.window_start(now),
+            "bucketSeconds": self.bucket_seconds,
+            "checks": totals["checks"],
+            "unverifiedChecks": totals["unverified"],
+            "averageScore": totals["scoreSum"] / verified if verified else None,
+            "labels": dict(totals["labels"]),
+            "flaggedClaims": totals["flaggedClaims"],
+            "series": series,
+        }
+
+    def to_dict(self):
+        return {
+            "bucketSeconds": self.bucket_seconds,
+            "numBuckets": self.num_buckets,
+            "buckets": [[start, self.buckets[start]] for start in self.order],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        counters = cls(data["bucketSeconds"], data["numBuckets"])
+        for start, bucket in data["buckets"]:
+            counters.buckets[start] = dict(bucket, labels=Counter(bucket["labels"]))
+            counters.order.append(start)
+        return counters
+
+
+# _trends_lock guards only the in-memory aggregates so reads never wait on disk
+# I/O. _trends_log_lock serializes log appends, snapshots and the initial load;
+# it is always taken before _trends_lock, never the other way round.
+_trends_lock = threading.Lock()
+_trends_log_lock = threading.Lock()
+_trends = {}
+_TOPK_FIELDS = ("flaggedClaims", "flaggedPublishers", "flaggingReviewers")
+
+
+def _reset_trend_aggregates():
+    _trends.update(
+        counters=RollingTrendCounters(),
+        totalChecks=0,
+        since=None,
+        logOffset=0,
+        loaded=False,
+    )
+    for field in _TOPK_FIELDS:
+        _trends[field] = WindowedTopK()
+
+
+_reset_trend_aggregates()
+
+
+def _parse_event(line):
+    """Decode one event log line, or return None if it is partial or malformed."""
+    try:
+        raw = json.loads(line)
+        event = {
+            "timestamp": float(raw["timestamp"]),
+            "label": str(raw["label"]),
+            "score": float(raw["score"]),
+            "verified": bool(raw.get("verified", raw["label"] != "Unverified")),
+        }
+        for field in _TOPK_FIELDS:
+            event[field] = raw.get(field, [])
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return None
+    for field in _TOPK_FIELDS:
+        if not isinstance(event[field], list) or not all(isinstance(v, str) for v in event[field]):
+            return None
+    return event
+
+
+def _aggregate_event(event, now):
+    """Fold a single fact-check event into the in-memory aggregates (caller holds _trends_lock)."""
+    counters = _trends["counters"]
+    counters.add(event, now)
+    window_start = counters.window_start(now)
+    for field in _TOPK_FIELDS:
+        for text in event[field]:
+            _trends[field].add(text, event["timestamp"], window_start)
+    _trends["totalChecks"] += 1
+    if _trends["since"] is None:
+        _trends["since"] = event["timestamp"]
+
+
+def _save_trend_snapshot():
+    """Checkpoint the aggregates with the log offset they cover (caller holds _trends_log_lock)."""
+    with _trends_lock:
+        data = {
+            "version": TRENDS_SNAPSHOT_VERSION,
+            "logOffset": _trends["logOffset"],
+            "totalChecks": _trends["totalChecks"],
+            "since": _trends["since"],
+            "counters": _trends["counters"].to_dict(),
+        }
+        for field in _TOPK_FIELDS:
+            data[field] = _trends[field].to_dict()
+        snapshot = json.dumps(data)
+    try:
+        tmp_path = TRENDS_SNAPSHOT + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(snapshot)
+        os.replace(tmp_path, TRENDS_SNAPSHOT)
+    except OSError as e:
+        print(f"Trend snapshot error: {e}")
+
+
+def _load_trend_snapshot(log_size):
+    """Restore aggregates from the snapshot; return False if it is missing, stale or unreadable."""
+    if not os.path.exists(TRENDS_SNAPSHOT):
+        return False
+    try:
+        with open(TRENDS_SNAPSHOT, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get("version") != TRENDS_SNAPSHOT_VERSION or data["logOffset"] > log_size:
+            return False  # Older format, or the log was truncated/replaced since the checkpoint
+        restored = {
+            "counters": RollingTrendCounters.from_dict(data["counters"]),
+            "totalChecks": data["totalChecks"],
+            "since": data["since"],
+            "logOffset": data["logOffset"],
+        }
+        for field in _TOPK_FIELDS:
+            restored[field] = WindowedTopK.from_dict(data[field])
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+        print(f"Ignoring trend snapshot: {e}")
+        return False
+    with _trends_lock:
+        _trends.update(restored)
+    return True
+
+
+def load_trend_aggregates():
+    """Restore the aggregates from the last snapshot and replay the log tail after it."""
+    if _trends["loaded"]:
+        return  # Fast path: don't wait behind log writes once loaded
+    with _trends_log_lock:
+        if _trends["loaded"]:
+            return
+        log_size = os.path.getsize(TRENDS_EVENT_LOG) if os.path.exists(TRENDS_EVENT_LOG) else 0
+        if not _load_trend_snapshot(log_size):
+            with _trends_lock:
+                _reset_trend_aggregates()
+
+        now = time.time()
+        replayed = skipped = 0
+        torn_tail = False
+        if log_size > _trends["logOffset"]:
+            with open(TRENDS_EVENT_LOG, 'rb') as f:
+                f.seek(_trends["logOffset"])
+                for line in f:
+                    torn_tail = not line.endswith(b"\n")
+                    event = _parse_event(line)
+                    with _trends_lock:
+                        _trends["logOffset"] += len(line)
+                        if event is None:
+                            skipped += 1
+                            continue
+                        _aggregate_event(event, now)
+                    replayed += 1
+            if torn_tail:
+                # Terminate a partially written last line so the next append starts cleanly
+                with open(TRENDS_EVENT_LOG, 'ab') as f:
+                    f.write(b"\n")
+                with _trends_lock:
+                    _trends["logOffset"] += 1
+            print(f"Replayed {replayed} fact-check events from {TRENDS_EVENT_LOG} (skipped {skipped})")
+            _save_trend_snapshot()
+        _trends["loaded"] = True
+
+
+def _dedupe(values):
+    """Drop empty values and duplicates by normalized key, keeping the first spelling."""
+    seen = {}
+    for value in values:
+        key = normalize_key(value)
+        if key and key not in seen:
+            seen[key] = value.strip()
+    return list(seen.values())
+
+
+def record_fact_check_event(label, score, verified, flagged_claims, flagged_publishers, flagging_reviewers):
+    """Append a fact-check outcome to the event log and update the trend aggregates.
+
+    `flagged_publishers` are the sources of the flagged content (article host,
+    claimants); `flagging_reviewers` are the fact-checkers who issued the ratings.
+    """
+    load_trend_aggregates()
+    event = {
+        "timestamp": time.time(),
+        "label": label,
+        "score": score,
+        "verified": verified,
+        "flaggedClaims": _dedupe(flagged_claims),
+        "flaggedPublishers": _dedupe(flagged_publishers),
+        "flaggingReviewers": _dedupe(flagging_reviewers),
+    }
+    line = (json.dumps(event) + "\n").encode('utf-8')
+    with _trends_log_lock:
+        try:
+            os.makedirs(os.path.dirname(TRENDS_EVENT_LOG), exist_ok=True)
+            with open(TRENDS_EVENT_LOG, 'ab') as f:
+                f.write(line)
+                offset = f.tell()
+        except OSError as e:
+            print(f"Trend event log error: {e}")
+            offset = None
+        with _trends_lock:
+            _aggregate_event(event, event["timestamp"])
+            if offset is not None:
+                _trends["logOffset"] = offset
+            checkpoint = offset is not None and _trends["totalChecks"] % TRENDS_SNAPSHOT_EVERY == 0
+        if checkpoint:
+            _save_trend_snapshot()
+
+
+def get_trends(now=None):
+    """Answer a trends query from the precomputed aggregates."""
+    load_trend_aggregates()
+    now = time.time() if now is None else now
+    with _trends_lock:
+        counters = _trends["counters"]
+        window_start = counters.window_start(now)
+        trends = {
+            "generatedAt": now,
+            "totalChecks": _trends["totalChecks"],
+            "since": _trends["since"],
+            "window": counters.snapshot(now),
+        }
+        # Top-k lists rotate in daily slices, so they may reach up to a day before windowStart
+        trends["topFlaggedClaims"] = _trends["flaggedClaims"].items(window_start)
+        trends["topFlaggedPublishers"] = _trends["flaggedPublishers"].items(window_start)
+        trends["topFlaggingReviewers"] = _trends["flaggingReviewers"].items(window_start)
+    return trends